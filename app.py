@@ -1,14 +1,19 @@
 from __future__ import annotations
 
-# NOTE: this is a NEW file – a lightweight Flask frontend that streams
-# conspiracy-theory output to the browser in real-time.
+# NOTE: this is a NEW file – a lightweight Quart (async Flask) frontend that
+# streams conspiracy-theory output to the browser in real-time.
 
+import asyncio
 import importlib.util
 import pathlib
+import socket
 import textwrap
+import time
 from typing import AsyncGenerator
 
-from flask import Flask, Response, render_template, request
+from hypercorn.asyncio import serve
+from hypercorn.config import Config, Sockets
+from quart import Quart, Response, render_template, request
 from openai.types.responses import ResponseTextDeltaEvent
 
 # ---------------------------------------------------------------------------
@@ -32,76 +37,118 @@ Runner = ctg_main.Runner
 ItemHelpers = ctg_main.ItemHelpers
 
 # ---------------------------------------------------------------------------
-# Flask application
+# Quart application
 # ---------------------------------------------------------------------------
 
-app = Flask(__name__, static_folder="static", template_folder="templates")
+app = Quart(__name__, static_folder="static", template_folder="templates")
+
+# Tokens are coalesced into one SSE frame per ~50 ms window (or every 16
+# tokens, whichever comes first) rather than one frame per token.
+_SSE_FLUSH_TOKENS = 16
+_SSE_FLUSH_INTERVAL = 0.05  # seconds
+
+
+def _sse_frame(text: str) -> bytes:
+    """Encode *text* as a single SSE ``message`` event.
+
+    Each line gets its own ``data:`` field; the browser's ``EventSource``
+    joins them back together with newlines, so multi-line chunks survive.
+    """
+
+    return ("".join(f"data: {line}\n" for line in text.split("\n")) + "\n").encode()
+
+
+@app.after_serving
+async def _close_http_sessions() -> None:
+    """Release the pooled connections shared across requests."""
+    await ctg_main.close_aiohttp_session()
 
 
 @app.route("/")
-def index() -> str:  # noqa: D401 – simple wrapper
+async def index() -> str:  # noqa: D401 – simple wrapper
     """Render the landing page."""
-    return render_template("index.html")
+    return await render_template("index.html")
 
 
 @app.route("/stream")
-def stream() -> Response:
-    """SSE endpoint that **synchronously** streams text to the browser.
-
-    Flask's development WSGI server can't directly iterate over *async* generators,
-    which caused the previous *TypeError: 'async_generator' object is not
-    iterable*.  We bridge the async world (the agent) and the sync WSGI world by
-    running the generation coroutine inside a **background thread** and pushing
-    chunks onto a ``queue.Queue``.  The synchronous generator that Flask
-    iterates over pops items from that queue and yields them as Server-Sent
-    Events in real time.
-    """
+async def stream() -> Response:
+    """SSE endpoint that streams text to the browser as it is generated.
 
-    import asyncio
-    import queue
-    import threading
+    Quart iterates *async* generators natively, so the agent's event stream is
+    consumed by the very task that writes the response – no background thread,
+    no queue and no per-request event loop sit between a token and the socket.
+    """
 
     topic = (request.args.get("topic") or "").strip()
     if not topic:
         return Response("Topic query parameter 'topic' is required", status=400)
 
-    q: "queue.Queue[str | None]" = queue.Queue()
-
-    async def _produce() -> None:
-        """Async producer that puts SSE data strings onto the queue."""
+    async def _produce() -> AsyncGenerator[bytes, None]:
+        """Async generator that yields encoded SSE frames."""
 
         result_stream = Runner.run_streamed(conspiracy_agent, input=topic)
+
+        buf: list[str] = []
+        last = time.monotonic()
+
         async for event in result_stream.stream_events():
             if (
                 event.type == "raw_response_event"
                 and isinstance(event.data, ResponseTextDeltaEvent)
             ):
-                token = event.data.delta
-                q.put(f"data: {token}\n\n")
+                buf.append(event.data.delta)
+                if len(buf) < _SSE_FLUSH_TOKENS and time.monotonic() - last <= _SSE_FLUSH_INTERVAL:
+                    continue
             elif (
                 event.type == "run_item_stream_event"
                 and event.item.type == "message_output_item"
             ):
-                chunk = ItemHelpers.text_message_output(event.item)
-                q.put(f"data: {chunk}\n\n")
+                buf.append(ItemHelpers.text_message_output(event.item))
+
+            # Any other event (tool calls, etc.) may precede a pause, so push
+            # out whatever is buffered instead of holding it back.
+            if buf:
+                yield _sse_frame("".join(buf))
+                buf.clear()
+            last = time.monotonic()
+
+        if buf:
+            yield _sse_frame("".join(buf))
 
         # Signal completion
-        q.put("data: [DONE]\n\n")
-        q.put(None)  # sentinel for the consumer
+        yield b"data: [DONE]\n\n"
 
-    # Kick-off the async producer inside a background thread so it doesn't block
-    threading.Thread(target=lambda: asyncio.run(_produce()), daemon=True).start()
+    response = Response(_produce(), mimetype="text/event-stream")
+    # Agent runs routinely outlast Quart's default response timeout.
+    response.timeout = None
+    return response
 
-    def _consume():
-        """Synchronous generator that yields SSE strings to Flask/Werkzeug."""
 
-        while True:
-            item = q.get()
-            if item is None:
-                break
-            yield item
+# ---------------------------------------------------------------------------
+# ASGI server configuration
+# ---------------------------------------------------------------------------
+
+# Send buffer for SSE connections; large enough that a coalesced frame never
+# has to wait for the peer to drain a small default buffer.
+_SSE_SNDBUF = 256 * 1024
 
-    return Response(_consume(), mimetype="text/event-stream")
+
+class StreamingConfig(Config):
+    """Hypercorn config whose TCP listening sockets are tuned for SSE.
+
+    ``TCP_NODELAY`` stops Nagle's algorithm from holding small frames back
+    while waiting for an ACK, and ``SO_SNDBUF`` is raised so bursts are
+    handed to the kernel in one go.  Accepted connections inherit both
+    options from the listening socket.
+    """
+
+    def create_sockets(self) -> Sockets:
+        sockets = super().create_sockets()
+        for sock in [*sockets.secure_sockets, *sockets.insecure_sockets]:
+            if sock.family in (socket.AF_INET, socket.AF_INET6):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, _SSE_SNDBUF)
+        return sockets
 
 
 # ---------------------------------------------------------------------------
@@ -119,6 +166,9 @@ if __name__ == "__main__":
         """
     )
     print(banner)
-    # ``threaded=True`` lets Flask keep accepting new connections while the
-    # asyncio event-loop inside each request does its work.
-    app.run(host="127.0.0.1", port=5000, debug=True, threaded=True) 
\ No newline at end of file
+
+    config = StreamingConfig()
+    config.bind = ["127.0.0.1:5000"]
+    # Keep idle connections around so the browser can reuse them between runs.
+    config.keep_alive_timeout = 75
+    asyncio.run(serve(app, config)) 
\ No newline at end of file